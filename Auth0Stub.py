@@ -0,0 +1,142 @@
+import os
+import time
+import uuid
+import threading
+from urllib.parse import urlencode
+from flask import Flask, redirect, request, jsonify
+from authlib.jose import JsonWebKey, jwt
+
+# Local stand-in for the Auth0 tenant registered in RRGCharts via oauth.register('auth0', ...).
+# It approves every /authorize request without a login form so scripted clients (LoadTest.py)
+# can walk the full redirect flow. Never deploy this anywhere real.
+#
+# Run it with:
+#   gunicorn -b 127.0.0.1:8060 --threads 8 Auth0Stub:app
+# and start RRGCharts with AUTH0_BASE_URL=http://127.0.0.1:8060 and AUTHLIB_INSECURE_TRANSPORT=1
+
+STUB_BASE_URL = os.environ.get("AUTH0_BASE_URL") or "http://127.0.0.1:8060"
+TOKEN_TTL = 3600
+
+app = Flask(__name__)
+
+# Signing key for id_tokens, regenerated on every start and published via the JWKS endpoint
+signing_key = JsonWebKey.generate_key('RSA', 2048, is_private=True)
+public_jwk = signing_key.as_dict(is_private=False)
+public_jwk.setdefault('kid', signing_key.thumbprint())
+public_jwk.update({'use': 'sig', 'alg': 'RS256'})
+
+# Issued codes and tokens live in memory, so run the stub as a single process
+lock = threading.Lock()
+auth_codes = {}
+access_tokens = {}
+
+
+def make_profile(login_hint):
+    user = login_hint or f"loadtest-{uuid.uuid4().hex[:8]}"
+    return {
+        'sub': f"auth0|{user}",
+        'name': user,
+        'nickname': user,
+        'picture': '',
+        'email': f"{user}@example.com",
+        'email_verified': True,
+    }
+
+
+@app.route('/authorize')
+def authorize():
+    redirect_uri = request.args.get('redirect_uri')
+    if request.args.get('response_type') != 'code' or not redirect_uri:
+        return jsonify(error="unsupported_response_type"), 400
+
+    code = uuid.uuid4().hex
+    with lock:
+        auth_codes[code] = {
+            'client_id': request.args.get('client_id'),
+            'redirect_uri': redirect_uri,
+            'nonce': request.args.get('nonce'),
+            'profile': make_profile(request.args.get('login_hint')),
+        }
+
+    params = {'code': code}
+    if 'state' in request.args:
+        params['state'] = request.args['state']
+    separator = '&' if '?' in redirect_uri else '?'
+    return redirect(f"{redirect_uri}{separator}{urlencode(params)}")
+
+
+@app.route('/oauth/token', methods=['POST'])
+def token():
+    # Accept both client_secret_basic (authlib's default) and client_secret_post
+    client_id = request.authorization.username if request.authorization else request.form.get('client_id')
+
+    with lock:
+        grant = auth_codes.pop(request.form.get('code'), None)
+    if request.form.get('grant_type') != 'authorization_code' or grant is None:
+        return jsonify(error="invalid_grant"), 400
+    if grant['redirect_uri'] != request.form.get('redirect_uri'):
+        return jsonify(error="invalid_grant", error_description="redirect_uri mismatch"), 400
+
+    now = int(time.time())
+    claims = dict(grant['profile'], iss=f"{STUB_BASE_URL}/", aud=client_id or grant['client_id'], iat=now, exp=now + TOKEN_TTL)
+    if grant['nonce']:
+        claims['nonce'] = grant['nonce']
+    id_token = jwt.encode({'alg': 'RS256', 'kid': public_jwk['kid']}, claims, signing_key).decode('ascii')
+
+    access_token = uuid.uuid4().hex
+    with lock:
+        access_tokens[access_token] = grant['profile']
+
+    return jsonify(
+        access_token=access_token,
+        id_token=id_token,
+        token_type='Bearer',
+        expires_in=TOKEN_TTL,
+        scope='openid profile email',
+    )
+
+
+@app.route('/userinfo')
+def userinfo():
+    auth_header = request.headers.get('Authorization', '')
+    with lock:
+        profile = access_tokens.get(auth_header[len('Bearer '):]) if auth_header.startswith('Bearer ') else None
+    if profile is None:
+        return jsonify(error="invalid_token"), 401
+    return jsonify(profile)
+
+
+@app.route('/.well-known/jwks.json')
+def jwks():
+    return jsonify(keys=[public_jwk])
+
+
+@app.route('/.well-known/openid-configuration')
+def openid_configuration():
+    return jsonify(
+        issuer=f"{STUB_BASE_URL}/",
+        authorization_endpoint=f"{STUB_BASE_URL}/authorize",
+        token_endpoint=f"{STUB_BASE_URL}/oauth/token",
+        userinfo_endpoint=f"{STUB_BASE_URL}/userinfo",
+        jwks_uri=f"{STUB_BASE_URL}/.well-known/jwks.json",
+        end_session_endpoint=f"{STUB_BASE_URL}/v2/logout",
+        response_types_supported=['code'],
+        id_token_signing_alg_values_supported=['RS256'],
+    )
+
+
+@app.route('/v2/logout')
+def logout():
+    return_to = request.args.get('returnTo')
+    if return_to:
+        return redirect(return_to)
+    return jsonify(status="logged out"), 200
+
+
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify(status="healthy"), 200
+
+
+if __name__ == '__main__':
+    app.run(host='127.0.0.1', port=8060, threaded=True)
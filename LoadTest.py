@@ -0,0 +1,343 @@
+import os
+import sys
+import json
+import time
+import math
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+import urllib.error
+import urllib.request
+from http.cookiejar import CookieJar
+from concurrent.futures import ThreadPoolExecutor
+
+# Load driver for RRGCharts:app. Each virtual user logs in through the Auth0 redirect flow
+# (against Auth0Stub.py), then replays the Dash callback POSTs a browser sends while
+# browsing the Sector Overview. Latency percentiles and throughput are reported for each
+# gunicorn worker configuration.
+#
+# Compare worker classes and counts (starts the stub and gunicorn for every config):
+#   python LoadTest.py --configs sync:4 gthread:4x8 gevent:8 --users 32 --duration 60
+# Drive an already running server (must already point at a stub via AUTH0_BASE_URL):
+#   python LoadTest.py --url http://127.0.0.1:8050 --users 16 --duration 30
+
+APP_HOST = '127.0.0.1'
+APP_PORT = 8050
+STUB_PORT = 8060
+DASH_UPDATE_PATH = '/_dash-update-component'
+
+# Used if the sector list can't be discovered from the Sector Overview layout
+DEFAULT_SECTORS = [
+    'Financials', 'Health Care', 'Industrials', 'Consumer Staples', 'Consumer Discretionary', 'Utilities',
+    'Materials', 'Information Technology', 'Real Estate', 'Communication Services', 'Energy'
+]
+
+
+def parse_config(spec):
+    """Parse 'class:workers[xthreads]', e.g. 'sync:4' or 'gthread:4x8'."""
+    worker_class, _, size = spec.partition(':')
+    workers, _, threads = (size or '1').partition('x')
+    return {'worker_class': worker_class, 'workers': int(workers), 'threads': int(threads or 1)}
+
+
+def config_label(config):
+    label = f"{config['worker_class']}:{config['workers']}"
+    if config['threads'] > 1:
+        label += f"x{config['threads']}"
+    return label
+
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def display_page_payload(button_id, clicks):
+    inputs = [
+        {'id': 'sector-overview-btn', 'property': 'n_clicks', 'value': clicks if button_id == 'sector-overview-btn' else 0},
+        {'id': 'industry-overview-btn', 'property': 'n_clicks', 'value': clicks if button_id == 'industry-overview-btn' else 0},
+        {'id': 'stock-list-btn', 'property': 'n_clicks', 'value': clicks if button_id == 'stock-list-btn' else 0},
+        {'id': 'sector-comparison-btn', 'property': 'n_clicks', 'value': clicks if button_id == 'sector-comparison-btn' else 0},
+        {'id': 'url', 'property': 'pathname', 'value': '/'},
+    ]
+    return {
+        'output': 'page-content.children',
+        'outputs': {'id': 'page-content', 'property': 'children'},
+        'inputs': inputs,
+        'changedPropIds': [f'{button_id}.n_clicks'],
+        'state': [],
+    }
+
+
+def update_chart_payload(sector):
+    return {
+        'output': '..sector-market-chart.figure...industry-charts-container.children..',
+        'outputs': [
+            {'id': 'sector-market-chart', 'property': 'figure'},
+            {'id': 'industry-charts-container', 'property': 'children'},
+        ],
+        'inputs': [{'id': 'sector-dropdown', 'property': 'value', 'value': sector}],
+        'changedPropIds': ['sector-dropdown.value'],
+        'state': [],
+    }
+
+
+def comparison_chart_payload(sectors):
+    return {
+        'output': 'comparison-chart.figure',
+        'outputs': {'id': 'comparison-chart', 'property': 'figure'},
+        'inputs': [{'id': 'comparison-sector-dropdown', 'property': 'value', 'value': sectors}],
+        'changedPropIds': ['comparison-sector-dropdown.value'],
+        'state': [],
+    }
+
+
+def correlation_heatmap_payload(window):
+    return {
+        'output': 'correlation-heatmap.figure',
+        'outputs': {'id': 'correlation-heatmap', 'property': 'figure'},
+        'inputs': [{'id': 'correlation-window-dropdown', 'property': 'value', 'value': window}],
+        'changedPropIds': ['correlation-window-dropdown.value'],
+        'state': [],
+    }
+
+
+def find_component(node, component_id):
+    if isinstance(node, dict):
+        if node.get('props', {}).get('id') == component_id:
+            return node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = find_component(child, component_id)
+        if found is not None:
+            return found
+    return None
+
+
+class Stats:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, name, latency, ok):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(latency)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, names=None):
+        with self.lock:
+            names = names or list(self.latencies)
+            values = sorted(v for name in names for v in self.latencies.get(name, []))
+            errors = sum(self.errors.get(name, 0) for name in names)
+        return {
+            'requests': len(values),
+            'errors': errors,
+            'p50': percentile(values, 50) * 1000,
+            'p95': percentile(values, 95) * 1000,
+            'p99': percentile(values, 99) * 1000,
+        }
+
+
+class VirtualUser:
+
+    def __init__(self, base_url, stats, user_id, think_time):
+        self.base_url = base_url.rstrip('/')
+        self.stats = stats
+        self.user_id = user_id
+        self.think_time = think_time
+        self.random = random.Random(user_id)
+        self.clicks = 0
+        self.sectors = DEFAULT_SECTORS
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+    def request(self, name, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        req = urllib.request.Request(f"{self.base_url}{path}", data=data)
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+
+        start = time.perf_counter()
+        body, url, ok = None, None, False
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                body = resp.read()
+                url = resp.geturl()
+                ok = resp.status == 200
+        except (urllib.error.URLError, http.client.HTTPException, OSError):
+            # Failed and truncated responses count as errors; the user keeps going
+            pass
+        self.stats.record(name, time.perf_counter() - start, ok)
+        return ok, url, body
+
+    def login(self):
+        # /login -> stub /authorize -> /callback -> /dashboard, all followed by urllib
+        ok, url, _ = self.request('login', f"/login?login_hint=loadtest-{self.user_id}")
+        return ok and url is not None and url.endswith('/dashboard')
+
+    def display_page(self, button_id):
+        self.clicks += 1
+        ok, _, body = self.request('display_page', DASH_UPDATE_PATH, display_page_payload(button_id, self.clicks))
+        return ok, body
+
+    def update_chart(self, sector):
+        ok, _, _ = self.request('update_chart', DASH_UPDATE_PATH, update_chart_payload(sector))
+        return ok
+
+    def open_comparison(self):
+        self.display_page('sector-comparison-btn')
+        sectors = self.random.sample(self.sectors, k=min(len(self.sectors), self.random.randint(2, 6)))
+        self.request('comparison_chart', DASH_UPDATE_PATH, comparison_chart_payload(sectors))
+        self.request('correlation', DASH_UPDATE_PATH, correlation_heatmap_payload(self.random.choice([21, 63, 126, 252])))
+
+    def discover_sectors(self, body):
+        try:
+            dropdown = find_component(json.loads(body), 'sector-dropdown')
+        except (TypeError, ValueError):
+            dropdown = None
+        if dropdown is not None:
+            self.sectors = [option['value'] for option in dropdown['props'].get('options', [])] or DEFAULT_SECTORS
+
+    def think(self):
+        if self.think_time > 0:
+            time.sleep(self.random.uniform(0, 2 * self.think_time))
+
+    def run(self, deadline):
+        if not self.login():
+            return
+
+        # Open the Sector Overview, then browse a few sectors before switching views
+        while time.perf_counter() < deadline:
+            ok, body = self.display_page('sector-overview-btn')
+            if ok and self.sectors is DEFAULT_SECTORS:
+                self.discover_sectors(body)
+            self.think()
+
+            for sector in self.random.sample(self.sectors, k=min(len(self.sectors), self.random.randint(2, 6))):
+                if time.perf_counter() >= deadline:
+                    return
+                self.update_chart(sector)
+                self.think()
+
+            if self.random.random() < 0.2:
+                self.display_page('industry-overview-btn')
+                self.think()
+
+            if self.random.random() < 0.2:
+                self.open_comparison()
+                self.think()
+
+
+def run_load(base_url, users, duration, think_time):
+    stats = Stats()
+    start = time.perf_counter()
+    deadline = start + duration
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        futures = [pool.submit(VirtualUser(base_url, stats, user_id, think_time).run, deadline) for user_id in range(users)]
+        for future in futures:
+            # Re-raise anything that killed a virtual user instead of silently under-reporting load
+            future.result()
+    return stats, time.perf_counter() - start
+
+
+def wait_for_health(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=2) as resp:
+                if resp.status == 200:
+                    return True
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.25)
+    return False
+
+
+def start_gunicorn(target, bind, config=None, env=None):
+    cmd = [sys.executable, '-m', 'gunicorn', '-b', bind]
+    if config:
+        cmd += ['--worker-class', config['worker_class'], '--workers', str(config['workers']), '--threads', str(config['threads'])]
+    else:
+        cmd += ['--threads', '8']
+    cmd.append(target)
+    return subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_process(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def print_report(label, stats, elapsed):
+    print(f"{'config':<16}{'endpoint':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = [('all', stats.summary())] + [(name, stats.summary([name])) for name in sorted(stats.latencies)]
+    for endpoint, s in rows:
+        print(f"{label:<16}{endpoint:<16}{s['requests']:>10}{s['errors']:>8}{s['requests'] / elapsed:>10.1f}"
+              f"{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test RRGCharts:app behind a local Auth0 stand-in")
+    parser.add_argument('--url', help="Drive an already running server instead of starting gunicorn")
+    parser.add_argument('--configs', nargs='+', default=['sync:4', 'gthread:4x8'],
+                        help="gunicorn worker configs as class:workers[xthreads]")
+    parser.add_argument('--users', type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds to run each config")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Mean seconds between a user's requests")
+    args = parser.parse_args()
+
+    if args.url:
+        stats, elapsed = run_load(args.url, args.users, args.duration, args.think_time)
+        print_report('external', stats, elapsed)
+        return
+
+    stub_url = f"http://{APP_HOST}:{STUB_PORT}"
+    app_url = f"http://{APP_HOST}:{APP_PORT}"
+
+    env = dict(os.environ)
+    env.update({
+        'AUTH0_BASE_URL': stub_url,
+        'AUTH0_DOMAIN': f"{APP_HOST}:{STUB_PORT}",
+        'AUTH0_CLIENT_ID': env.get('AUTH0_CLIENT_ID') or 'loadtest-client',
+        'AUTH0_CLIENT_SECRET': env.get('AUTH0_CLIENT_SECRET') or 'loadtest-secret',
+        'AUTH0_CALLBACK_URL': f"{app_url}/callback",
+        'AUTHLIB_INSECURE_TRANSPORT': '1',
+    })
+
+    stub = start_gunicorn('Auth0Stub:app', f"{APP_HOST}:{STUB_PORT}", env=env)
+    try:
+        if not wait_for_health(stub_url):
+            sys.exit(f"Auth0 stub did not start on {stub_url}")
+
+        for spec in args.configs:
+            config = parse_config(spec)
+            server = start_gunicorn('RRGCharts:app', f"{APP_HOST}:{APP_PORT}", config=config, env=env)
+            try:
+                if not wait_for_health(app_url):
+                    print(f"{spec}: RRGCharts did not start, skipping")
+                    continue
+                stats, elapsed = run_load(app_url, args.users, args.duration, args.think_time)
+                print_report(config_label(config), stats, elapsed)
+            finally:
+                stop_process(server)
+    finally:
+        stop_process(stub)
+
+
+if __name__ == '__main__':
+    main()
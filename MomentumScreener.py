@@ -0,0 +1,157 @@
+import io
+import os
+import math
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Multi-horizon returns and relative strength vs. sector ETF for the Opportunity Set.
+# Kept out of RRGCharts.py so process pool workers can import it without building the app.
+
+# Trading-day lookbacks
+HORIZONS = [('1M', 21), ('3M', 63), ('6M', 126), ('12M', 252)]
+
+# Tolerate a few missing rows at the end of a ticker's file (holidays, late updates)
+FFILL_LIMIT = 5
+
+
+def read_tail(market_file, rows):
+    """Header plus roughly the last rows lines of a CSV, without reading the whole history."""
+    with open(market_file, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        block = 64 * rows
+        while True:
+            offset = max(start, end - block)
+            f.seek(offset)
+            data = f.read(end - offset)
+            if offset == start or data.count(b'\n') > rows:
+                break
+            block *= 2
+    if offset > start:
+        data = data[data.index(b'\n') + 1:]  # drop the partial first line
+    return io.BytesIO(header + data)
+
+
+def load_price_chunk(market_data_dir, tickers, dates):
+    """Read Adjusted_close for tickers and align it on dates. Returns a (len(dates), len(tickers)) matrix."""
+    # Market files use ISO dates, so alignment can compare strings instead of parsing timestamps
+    index = pd.DatetimeIndex(dates).strftime('%Y-%m-%d').to_numpy(dtype=str)
+    rows = np.arange(len(index))
+    tail_rows = 2 * len(index) + FFILL_LIMIT
+    prices = np.full((len(index), len(tickers)), np.nan)
+    for i, ticker in enumerate(tickers):
+        market_file = os.path.join(market_data_dir, f"{ticker}.US.csv")
+        if not os.path.exists(market_file):
+            continue
+        try:
+            df = pd.read_csv(read_tail(market_file, tail_rows), usecols=['Date', 'Adjusted_close'], dtype={'Date': str})
+            file_dates = df['Date'].to_numpy(dtype=str)
+            if not np.all(file_dates[:-1] <= file_dates[1:]):
+                # The tail only holds the latest rows if the file is in date order, so fall back to a full read
+                df = pd.read_csv(market_file, usecols=['Date', 'Adjusted_close'], dtype={'Date': str}).sort_values('Date', kind='stable')
+                file_dates = df['Date'].to_numpy(dtype=str)
+        except (ValueError, pd.errors.ParserError):
+            logging.getLogger(__name__).warning(f"Unreadable market file: {market_file}")
+            continue
+        if df.empty:
+            continue
+        close = pd.to_numeric(df['Adjusted_close'], errors='coerce').to_numpy(dtype=float)
+
+        # Forward fill: last row on or before each date, unless it is more than FFILL_LIMIT rows stale
+        pos = np.searchsorted(file_dates, index, side='right') - 1
+        found = pos >= 0
+        stale = rows - np.searchsorted(index, file_dates[np.maximum(pos, 0)])
+        valid = found & (stale <= FFILL_LIMIT)
+        prices[valid, i] = close[pos[valid]]
+    return prices
+
+
+def horizon_returns(prices, horizons):
+    """Returns over each horizon as of the last row. prices is (T, N); result is (len(horizons), N)."""
+    lookbacks = np.array([days for _, days in horizons])
+    returns = np.full((len(lookbacks), prices.shape[1]), np.nan)
+    available = lookbacks < prices.shape[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[available] = prices[-1] / prices[-1 - lookbacks[available]] - 1
+    return returns
+
+
+class MomentumScreener:
+
+    def __init__(self, market_data_dir, sector_etfs, benchmark='SPY', horizons=HORIZONS, max_workers=None):
+        self.market_data_dir = market_data_dir
+        self.sector_etfs = sector_etfs  # sector name -> ETF ticker
+        self.benchmark = benchmark
+        self.horizons = horizons
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    @property
+    def columns(self):
+        return [f"Ret {label} %" for label, _ in self.horizons] + [f"RS {label} %" for label, _ in self.horizons]
+
+    def data_dates(self):
+        # The benchmark's calendar defines the data date and the rows every ticker is aligned on
+        benchmark_file = os.path.join(self.market_data_dir, f"{self.benchmark}.US.csv")
+        dates = pd.read_csv(benchmark_file, usecols=['Date'], parse_dates=['Date'])['Date'].drop_duplicates().sort_values()
+        if dates.empty:
+            raise ValueError(f"No dates in benchmark file: {benchmark_file}")
+        lookback = max(days for _, days in self.horizons) + 1
+        return dates.iloc[-lookback:].to_numpy()
+
+    def screen(self, tickers_df):
+        """Momentum columns for tickers_df (needs 'Ticker' and 'Sector'), computed once per data date."""
+        dates = self.data_dates()
+        data_date = pd.Timestamp(dates[-1]).strftime('%Y%m%d')
+        universe = tickers_df[['Ticker', 'Sector']].dropna(subset=['Ticker']).drop_duplicates('Ticker')
+        key = (data_date, tuple(universe['Ticker']), tuple(universe['Sector']))
+
+        # One screen at a time; threads that arrive during a compute get its result from the cache
+        with self.lock:
+            if key not in self.cache:
+                logging.getLogger(__name__).info(f"Computing momentum for {len(universe)} tickers as of {data_date}")
+                self.cache = {key: self.compute(universe, dates)}
+            return self.cache[key]
+
+    def compute(self, universe, dates):
+        tickers = universe['Ticker'].tolist()
+        etfs = sorted(set(self.sector_etfs.values()))
+        prices = self.load_prices(tickers + etfs, dates)
+        stock_prices, etf_prices = prices[:, :len(tickers)], prices[:, len(tickers):]
+
+        stock_returns = horizon_returns(stock_prices, self.horizons)
+        etf_returns = horizon_returns(etf_prices, self.horizons)
+
+        # Pick each ticker's sector ETF column; tickers outside the mapping get NaN
+        etf_position = {etf: i for i, etf in enumerate(etfs)}
+        sector_idx = np.array([etf_position.get(self.sector_etfs.get(sector), -1) for sector in universe['Sector']], dtype=int)
+        sector_returns = np.full_like(stock_returns, np.nan)
+        mapped = sector_idx >= 0
+        sector_returns[:, mapped] = etf_returns[:, sector_idx[mapped]]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative_strength = (1 + stock_returns) / (1 + sector_returns) - 1
+
+        values = np.vstack([stock_returns, relative_strength]).T * 100
+        result = pd.DataFrame(values, columns=self.columns).round(2)
+        result.insert(0, 'Ticker', tickers)
+        return result
+
+    def load_prices(self, tickers, dates):
+        chunk_count = min(len(tickers), self.max_workers * 4)
+        if self.max_workers == 1 or chunk_count <= 1:
+            return load_price_chunk(self.market_data_dir, tickers, dates)
+
+        chunk_size = math.ceil(len(tickers) / chunk_count)
+        chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+        # Not fork: screens run inside threaded gunicorn workers, and a forked child can inherit a held lock
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('forkserver')) as pool:
+            matrices = pool.map(load_price_chunk, [self.market_data_dir] * len(chunks), chunks, [dates] * len(chunks))
+            return np.hstack(list(matrices))
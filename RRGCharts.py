@@ -9,6 +9,8 @@ import re
 import logging
 import dash_bootstrap_components as dbc
 
+from MomentumScreener import MomentumScreener
+
 from flask import Flask, redirect, request, session, url_for, jsonify
 from authlib.integrations.flask_client import OAuth
 from functools import wraps
@@ -20,6 +22,15 @@ AUTH0_CLIENT_SECRET = os.environ.get("AUTH0_CLIENT_SECRET")
 AUTH0_DOMAIN = os.environ.get("AUTH0_DOMAIN")
 AUTH0_CALLBACK_URL = os.environ.get("AUTH0_CALLBACK_URL")
 AUTH0_AUDIENCE = os.environ.get("AUTH0_AUDIENCE") 
+# Override to point at a different issuer, e.g. the local Auth0Stub used for load testing
+AUTH0_BASE_URL = os.environ.get("AUTH0_BASE_URL") or f"https://{AUTH0_DOMAIN}"
+
+# Data locations
+RRG_DATA_HOME = os.path.expanduser(os.environ.get("RRG_DATA_HOME") or '~/Downloads/EquityProcessing/rrg/')
+MARKET_DATA_DIR = os.path.expanduser(os.environ.get("MARKET_DATA_DIR") or '~/Downloads/EquityProcessing/market_data/')
+
+# Processes per momentum screen, kept small since every gunicorn worker runs its own screen
+SCREENER_WORKERS = int(os.environ.get("SCREENER_WORKERS") or min(4, os.cpu_count() or 1))
 
 class RRGCharts:
 
@@ -34,10 +45,10 @@ class RRGCharts:
             'auth0',
             client_id=AUTH0_CLIENT_ID,
             client_secret=AUTH0_CLIENT_SECRET,
-            api_base_url=f"https://{AUTH0_DOMAIN}",
-            access_token_url=f"https://{AUTH0_DOMAIN}/oauth/token",
-            authorize_url=f"https://{AUTH0_DOMAIN}/authorize",
-            jwks_uri=f"https://{AUTH0_DOMAIN}/.well-known/jwks.json", 
+            api_base_url=AUTH0_BASE_URL,
+            access_token_url=f"{AUTH0_BASE_URL}/oauth/token",
+            authorize_url=f"{AUTH0_BASE_URL}/authorize",
+            jwks_uri=f"{AUTH0_BASE_URL}/.well-known/jwks.json", 
             client_kwargs={
                 'scope': 'openid profile email',
             },
@@ -47,8 +58,11 @@ class RRGCharts:
         self.app = Dash(__name__, server=self.server, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
         self.app.title = "Recursa Regime Analysis"
 
-        # FIXME DATA
-        # self.init_equity_list()
+        self.rrg_data_home = RRG_DATA_HOME
+        self.market_data_dir = MARKET_DATA_DIR
+
+        # (data version, aligned RRG panel, {window: correlation matrix}) for the comparison view
+        self.rrg_panel_cache = None
 
         # In a specific order so I can see cyclicals in one column and defensives in another
         self.sector_mapping = [
@@ -169,6 +183,16 @@ class RRGCharts:
         self.sorted_sector_mapping = sorted(self.sector_mapping, key=lambda x: (x[0], x[1]))
         self.sector_options = [{'label': f"{category}: {sector}", 'value': sector} for category, sector, ticker in self.sorted_sector_mapping]
 
+        # Relative strength is measured against the sector ETF, SPY is only the benchmark calendar
+        sector_etfs = {sector: ticker for category, sector, ticker in self.sector_mapping if category != 'Index'}
+        self.momentum_screener = MomentumScreener(self.market_data_dir, sector_etfs, max_workers=SCREENER_WORKERS)
+
+        self.comparison_sector_options = [{'label': f"{category}: {sector}", 'value': sector} for category, sector, ticker in self.sorted_sector_mapping if category != 'Index']
+        self.correlation_windows = [('1 Month', 21), ('3 Months', 63), ('6 Months', 126), ('1 Year', 252)]
+
+        # FIXME DATA
+        # self.init_equity_list()
+
         # Define a function to check if the user is authenticated
         def requires_auth(f):
             @wraps(f)
@@ -181,7 +205,8 @@ class RRGCharts:
         # Flask routes for login, callback, and logout
         @self.server.route('/login')
         def login():
-            return self.auth0.authorize_redirect(redirect_uri=AUTH0_CALLBACK_URL)
+            # login_hint pre-selects the account; LoadTest uses it to get one stub profile per virtual user
+            return self.auth0.authorize_redirect(redirect_uri=AUTH0_CALLBACK_URL, login_hint=request.args.get('login_hint'))
         
         @self.server.route('/health', methods=['GET'])
         def health():
@@ -207,7 +232,7 @@ class RRGCharts:
         def logout():
             session.clear()
             params = {'returnTo': url_for('home', _external=True), 'client_id': AUTH0_CLIENT_ID}
-            return redirect(f"https://{AUTH0_DOMAIN}/v2/logout?{urlencode(params)}")
+            return redirect(f"{AUTH0_BASE_URL}/v2/logout?{urlencode(params)}")
 
         @self.server.route('/dashboard')
         @requires_auth
@@ -251,6 +276,7 @@ class RRGCharts:
             html.Button("Sector Overview", id="sector-overview-btn", n_clicks=0),
             html.Button("Industry Overview", id="industry-overview-btn", n_clicks=0),
             html.Button("Opportunity Set", id="stock-list-btn", n_clicks=0),
+            html.Button("Sector Comparison", id="sector-comparison-btn", n_clicks=0),
             dcc.Location(id='url', refresh=False),
             html.Div(id='page-content')
         ])
@@ -350,10 +376,10 @@ class RRGCharts:
     def register_callbacks(self):
         @self.app.callback(
             Output('page-content', 'children'),
-            [Input('sector-overview-btn', 'n_clicks'), Input('industry-overview-btn', 'n_clicks'), Input('stock-list-btn', 'n_clicks'), Input('url', 'pathname')],
+            [Input('sector-overview-btn', 'n_clicks'), Input('industry-overview-btn', 'n_clicks'), Input('stock-list-btn', 'n_clicks'), Input('sector-comparison-btn', 'n_clicks'), Input('url', 'pathname')],
             prevent_initial_call=True
         )
-        def display_page(sector_clicks, industry_clicks, stock_clicks, pathname):
+        def display_page(sector_clicks, industry_clicks, stock_clicks, comparison_clicks, pathname):
             ctx = callback_context
             if not ctx.triggered:
                 return self.sector_overview_layout()
@@ -369,6 +395,8 @@ class RRGCharts:
                 return self.stock_list_layout()
             elif button_id == 'industry-overview-btn':
                 return self.industry_overview_layout()
+            elif button_id == 'sector-comparison-btn':
+                return self.sector_comparison_layout()
             elif pathname == '/login':
                 return dcc.Location(pathname='/login', id='login-redirect', href=self.auth0.authorize_redirect(redirect_uri=AUTH0_CALLBACK_URL))
             elif pathname == '/callback':
@@ -440,6 +468,75 @@ class RRGCharts:
 
             return sector_fig, industry_charts
 
+        @self.app.callback(
+            Output('comparison-chart', 'figure'),
+            [Input('comparison-sector-dropdown', 'value')]
+        )
+        def update_comparison_chart(selected_sectors):
+            _, panel, _ = self.get_rrg_panel()
+
+            fig = go.Figure()
+            for sector in selected_sectors or []:
+                if sector in panel.columns:
+                    series = panel[sector].dropna()
+                    fig.add_trace(go.Scatter(x=series.index, y=series.values, mode='lines', name=sector))
+
+            fig.update_layout(
+                title='Sector RRG Comparison',
+                xaxis_title='Date',
+                yaxis_title='RRG Value',
+                template='plotly_dark'
+            )
+            return fig
+
+        @self.app.callback(
+            Output('correlation-heatmap', 'figure'),
+            [Input('correlation-window-dropdown', 'value')]
+        )
+        def update_correlation_heatmap(window):
+            _, _, correlations = self.get_rrg_panel()
+            corr = correlations.get(window)
+            if corr is None or corr.empty:
+                return go.Figure()
+
+            fig = go.Figure(go.Heatmap(z=corr.values, x=corr.columns, y=corr.index, zmin=-1, zmax=1, colorscale='RdBu'))
+            fig.update_layout(
+                title=f'RRG Correlation, last {window} trading days',
+                template='plotly_dark',
+                height=900
+            )
+            return fig
+
+    def rrg_series_files(self):
+        # Sector columns first, then every industry, labelled the way the panel columns are named
+        files = [(sector, os.path.join(self.rrg_data_home, f"sector_{self.replace_invalid_filename_chars(sector)}.csv"))
+                 for sector in (option['value'] for option in self.comparison_sector_options)]
+        for sector, industries in self.sector_industry_mapping.items():
+            files += [(industry, os.path.join(self.rrg_data_home, self.replace_invalid_filename_chars(f"{sector}-{industry}.csv")))
+                      for industry in industries]
+        return [(label, path) for label, path in files if os.path.exists(path)]
+
+    def get_rrg_panel(self):
+        # The data version is the set of RRG files and their modification times, so a rewrite of any
+        # series rebuilds the panel while repeated views only stat the files
+        files = self.rrg_series_files()
+        version = tuple((path, os.stat(path).st_mtime_ns) for _, path in files)
+
+        cache = self.rrg_panel_cache
+        if cache is not None and cache[0] == version:
+            return cache
+
+        # One outer-join alignment of every series on Date
+        series = [pd.read_csv(path, usecols=['Date', 'rrg'], parse_dates=['Date']).drop_duplicates('Date', keep='last').set_index('Date')['rrg'].rename(label)
+                  for label, path in files]
+        panel = pd.concat(series, axis=1, join='outer').sort_index() if series else pd.DataFrame()
+
+        changes = panel.diff()
+        correlations = {window: changes.iloc[-window:].corr(min_periods=window // 2) for _, window in self.correlation_windows}
+
+        self.rrg_panel_cache = (version, panel, correlations)
+        return self.rrg_panel_cache
+
     def get_latest_oi_file(self):
         directory = os.path.expanduser('~/Downloads/EquityProcessing/oi/')
         pattern = re.compile(r"oi_(\d{8}_\d{6})\.csv$")
@@ -500,6 +597,26 @@ class RRGCharts:
             html.Div(id='industry-charts-container')
         ])
 
+    def sector_comparison_layout(self):
+        return html.Div([
+            html.H2("Sector Comparison"),
+            dcc.Dropdown(
+                id='comparison-sector-dropdown',
+                options=self.comparison_sector_options,
+                value=[option['value'] for option in self.comparison_sector_options],
+                multi=True
+            ),
+            dcc.Graph(id='comparison-chart'),
+            dcc.Dropdown(
+                id='correlation-window-dropdown',
+                options=[{'label': label, 'value': window} for label, window in self.correlation_windows],
+                value=63,
+                clearable=False,
+                style={'width': '50%'}
+            ),
+            dcc.Graph(id='correlation-heatmap')
+        ])
+
     def industry_overview_layout(self):
         return html.Div([
             html.H2("Industry Overview"),
@@ -511,16 +628,27 @@ class RRGCharts:
 
         # Ensure 'Finviz' column is correctly formatted as Markdown
         self.equities_df['Finviz'] = self.equities_df['Finviz'].apply(lambda x: f"[Finviz]({x.split('[Link](')[1][:-1]})")
-        
+
+        # Momentum is screened on open so a new data date is picked up without a restart; same date is a cache hit
+        try:
+            momentum_df = self.momentum_screener.screen(self.equities_df)
+        except (OSError, ValueError) as e:
+            # The table doesn't need market data, so show it with empty momentum columns
+            logging.getLogger(__name__).warning(f"Momentum screen failed: {e}")
+            momentum_df = pd.DataFrame(columns=['Ticker'] + self.momentum_screener.columns)
+        equities_df = self.equities_df.merge(momentum_df, on="Ticker", how="left")
+        column_order = ['Ticker', 'Description', 'Sector', 'Industry', 'Sub-Industry', 'Classification', 'Forward P/E', 'OI'] + self.momentum_screener.columns + ['Finviz', 'Ticker Comma']
+        equities_df = equities_df[column_order]
+
         return html.Div([
             html.H2("Opportunity Set"),
             dash_table.DataTable(
                 id='stock-table',
                 columns=[
                     {"name": i, "id": i, "presentation": "markdown"} if i == 'Finviz' else {"name": i, "id": i}
-                    for i in self.equities_df.columns
+                    for i in equities_df.columns
                 ],
-                data=self.equities_df.to_dict('records'),
+                data=equities_df.to_dict('records'),
                 markdown_options={"html": True},
                 style_cell={'textAlign': 'left'},
                 sort_action='native',